@@ -5,30 +5,74 @@ A Gradio-based application for converting Python code to other languages using A
 """
 
 import gradio as gr
-import traceback
+import logging
+import os
+import re
+import threading
+from enum import Enum
+from logging.handlers import RotatingFileHandler
 
 # Import core modules
-from core.models import QwenModel, OpenAIModel, ClaudeModel
+import core.models
 from core.executors import PythonExecutor
 from core.executors.docker_executor import DockerExecutor
-from core.utils import CodeValidator, FileManager
+from core.utils import CodeValidator, FileManager, LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Fenced code block; an unterminated fence runs to the end of the text
+_CODE_FENCE_RE = re.compile(r"^```[^\n]*\n(.*?)(?:^```[ \t]*$|\Z)", re.DOTALL | re.MULTILINE)
+
+# Status lines written around converted code; checked by first char before startswith
+_STATUS_PREFIXES = ('✅', '❌', '🔄', '**Error:**', '**Conversion')
+_STATUS_FIRST_CHARS = frozenset(prefix[0] for prefix in _STATUS_PREFIXES)
+
+
+class ModelKind(Enum):
+    """Backend family of a selectable model."""
+    QWEN = "Qwen"
+    OPENAI = "OpenAI"
+    CLAUDE = "Claude"
+
+
+# Kinds whose models need an API key from the user
+API_KEY_MODEL_KINDS = frozenset({ModelKind.OPENAI, ModelKind.CLAUDE})
+
+# Error shown when a model of the given kind is not ready
+UNAVAILABLE_MODEL_ERRORS = {
+    ModelKind.QWEN: "❌ **Error:** Qwen model is not available. Please check CUDA installation and model files.",
+    ModelKind.OPENAI: "❌ **Error:** OpenAI API key is required. Please provide your API key.",
+    ModelKind.CLAUDE: "❌ **Error:** Claude API key is required. Please provide your API key."
+}
 
 
 class CodeConverterApp:
     """Main application class for the Python Code Converter."""
     
     def __init__(self):
+        # Model class names in core.models; classes are imported and instantiated on first use
         self.models = {
-            "Qwen2.5-7B-Instruct (Local)": QwenModel(),
-            "OpenAI GPT-4o-mini": OpenAIModel(),
-            "Claude Sonnet 4": ClaudeModel()
+            "Qwen2.5-7B-Instruct (Local)": "VLLMQwenModel" if os.environ.get("USE_VLLM") == "1" else "QwenModel",
+            "OpenAI GPT-4o-mini": "OpenAIModel",
+            "Claude Sonnet 4": "ClaudeModel"
         }
+        self.model_kinds = {
+            "Qwen2.5-7B-Instruct (Local)": ModelKind.QWEN,
+            "OpenAI GPT-4o-mini": ModelKind.OPENAI,
+            "Claude Sonnet 4": ModelKind.CLAUDE
+        }
+        self._model_instances = {}
+        # One lock per model, so loading Qwen's weights never holds up the API models
+        self._model_locks = {name: threading.Lock() for name in self.models}
         
         self.python_executor = PythonExecutor()
         self.docker_executor = DockerExecutor()
         self.file_manager = FileManager()
         self.validator = CodeValidator()
         
+        # Recently converted code, keyed by conversion inputs
+        self._conversion_cache = LRUCache(max_size=256)
+        
         # Current API keys
         self.current_openai_key = None
         self.current_claude_key = None
@@ -40,6 +84,7 @@ class CodeConverterApp:
         """Initialize Docker support and log available languages."""
         if self.docker_executor.is_available():
             supported_languages = self.docker_executor.get_supported_languages()
+            self.docker_status = f"✅ **Docker is running** - Supported languages: {', '.join(supported_languages).upper()}"
             print(f"✅ Docker: Available with support for {', '.join(supported_languages)}")
             
             # Log language configurations
@@ -47,22 +92,45 @@ class CodeConverterApp:
                 info = self.docker_executor.get_language_info(lang)
                 if 'error' not in info:
                     print(f"   📋 {lang.upper()}: {info['image']} (timeout: {info['timeout']}s)")
+            
+            # Pull images up front so the first execution of each language is warm
+            ready_images = self.docker_executor.prefetch_images()
+            print(f"   🐳 Images ready: {', '.join(sorted(ready_images)) or 'none yet (still pulling)'}")
         else:
+            self.docker_status = "❌ **Docker is not available** - Please install and start Docker Desktop"
             print("⚠️ Docker: Not available - compiled language execution disabled")
     
+    def _get_model(self, model_name: str):
+        """Return the model instance for model_name, creating it on first use."""
+        model = self._model_instances.get(model_name)
+        if model is not None:
+            return model
+        
+        class_name = self.models.get(model_name)
+        if class_name is None:
+            return None
+        
+        with self._model_locks[model_name]:
+            if model_name not in self._model_instances:
+                # Resolving the class imports only the selected model's module and SDK
+                model_class = getattr(core.models, class_name)
+                self._model_instances[model_name] = model_class()
+            return self._model_instances[model_name]
+    
     def update_api_key(self, model_name: str, api_key: str) -> str:
         """Update API key for the selected model."""
         try:
-            if "OpenAI" in model_name:
+            kind = self.model_kinds.get(model_name)
+            if kind not in API_KEY_MODEL_KINDS:
+                return "ℹ️ No API key required for local model"
+            
+            if kind is ModelKind.OPENAI:
                 self.current_openai_key = api_key
-                self.models["OpenAI GPT-4o-mini"].update_api_key(api_key)
-                return "✅ OpenAI API key updated successfully"
-            elif "Claude" in model_name:
-                self.current_claude_key = api_key
-                self.models["Claude Sonnet 4"].update_api_key(api_key)
-                return "✅ Claude API key updated successfully"
             else:
-                return "ℹ️ No API key required for local model"
+                self.current_claude_key = api_key
+            
+            self._get_model(model_name).update_api_key(api_key)
+            return f"✅ {kind.value} API key updated successfully"
         except Exception as e:
             return f"❌ Failed to update API key: {str(e)}"
     
@@ -94,22 +162,22 @@ class CodeConverterApp:
                     return
             
             # Get the selected model
-            model = self.models.get(model_name)
+            model = self._get_model(model_name)
             if not model:
                 yield f"❌ **Error:** Unknown model: {model_name}"
                 return
             
             # Check if model is available
             if not model.is_available():
-                if "OpenAI" in model_name:
-                    yield "❌ **Error:** OpenAI API key is required. Please provide your API key."
-                    return
-                elif "Claude" in model_name:
-                    yield "❌ **Error:** Claude API key is required. Please provide your API key."
-                    return
-                elif "Qwen" in model_name:
-                    yield "❌ **Error:** Qwen model is not available. Please check CUDA installation and model files."
-                    return
+                yield UNAVAILABLE_MODEL_ERRORS[self.model_kinds[model_name]]
+                return
+            
+            # Reuse a previous conversion of the same inputs
+            cache_key = LRUCache.make_key(model_name, target_language, add_comments, python_code)
+            cached_code = self._conversion_cache.get(cache_key)
+            if cached_code is not None:
+                yield f"✅ **Conversion Successful**\n\n```{target_language.lower()}\n{cached_code}\n```"
+                return
             
             # Convert the code with streaming support
             if stream_response:
@@ -123,16 +191,18 @@ class CodeConverterApp:
                     formatted_output = f"🔄 **Generating...**\n\n```{target_language.lower()}\n{partial_content}\n```"
                     yield formatted_output
                 
+                self._conversion_cache.set(cache_key, partial_content)
                 final_output = f"✅ **Conversion Successful**\n\n```{target_language.lower()}\n{partial_content}\n```"
                 yield final_output
             else:
                 converted_code = model.convert_code(python_code, target_language, add_comments, stream=False)
+                self._conversion_cache.set(cache_key, converted_code)
                 final_output = f"✅ **Conversion Successful**\n\n```{target_language.lower()}\n{converted_code}\n```"
                 yield final_output
             
         except Exception as e:
-            error_trace = traceback.format_exc()
-            yield f"❌ **Conversion Failed:** {str(e)}\n\n**Debug Info:**\n```\n{error_trace}\n```"
+            logger.exception("Conversion failed (model=%s, language=%s)", model_name, target_language)
+            yield f"❌ **Conversion Failed:** {type(e).__name__}: {str(e)}\n\nSee codebridge.log for the full traceback."
     
     def execute_python_code(self, python_code: str) -> str:
         """Execute Python code and return results."""
@@ -189,29 +259,25 @@ class CodeConverterApp:
             return f"❌ **Save Failed:** {str(e)}"
     
     def _clean_code_output(self, output: str) -> str:
-        """Clean code output by removing markdown formatting and status messages."""
-        lines = output.split('\n')
-        code_lines = []
-        in_code_block = False
+        """Extract code from the first fenced block, or drop status lines from unfenced output."""
+        code = output.strip()
+        match = _CODE_FENCE_RE.search(code)
+        if not match:
+            lines = [
+                line for line in code.split('\n')
+                if not (line[:1] in _STATUS_FIRST_CHARS and line.startswith(_STATUS_PREFIXES))
+            ]
+            return '\n'.join(lines).strip()
         
-        for line in lines:
-            if line.strip().startswith(('✅', '❌', '**Error:**', '**Conversion')):
-                continue
-            
-            # Handle code blocks
-            if line.strip().startswith('```'):
-                in_code_block = not in_code_block
-                continue
-            
-            # If we're in a code block or this looks like code, add it
-            if in_code_block or (line.strip() and not line.startswith('*')):
-                code_lines.append(line)
-        
-        return '\n'.join(code_lines).strip()
+        while match:
+            code = match.group(1).strip()
+            # Models occasionally wrap their answer in a fence of their own
+            match = _CODE_FENCE_RE.match(code) if code.startswith('```') else None
+        return code
     
     def get_api_key_visibility(self, model_name: str) -> bool:
         """Determine if API key input should be visible."""
-        return "OpenAI" in model_name or "Claude" in model_name
+        return self.model_kinds.get(model_name) in API_KEY_MODEL_KINDS
     
     def create_interface(self):
         """Create and return the Gradio interface."""
@@ -359,19 +425,26 @@ class CodeConverterApp:
             convert_btn.click(
                 fn=self.convert_code,
                 inputs=[python_input, target_language, model_selection, add_comments, api_key_input, stream_response],
-                outputs=[converted_output]
+                outputs=[converted_output],
+                concurrency_id="llm",
+                concurrency_limit=8
             )
             
+            # Python and Docker executions share one pool of workers
             execute_python_btn.click(
                 fn=self.execute_python_code,
                 inputs=[python_input],
-                outputs=[python_result]
+                outputs=[python_result],
+                concurrency_id="exec",
+                concurrency_limit=8
             )
             
             execute_converted_btn.click(
                 fn=self.execute_converted_code,
                 inputs=[converted_output, target_language],
-                outputs=[converted_result]
+                outputs=[converted_result],
+                concurrency_id="exec",
+                concurrency_limit=8
             )
             
             save_btn.click(
@@ -407,13 +480,12 @@ class CodeConverterApp:
             )
             
             # Add Docker status information
-            if self.docker_executor.is_available():
-                supported_langs = self.docker_executor.get_supported_languages()
-                docker_status = f"✅ **Docker is running** - Supported languages: {', '.join(supported_langs).upper()}"
-            else:
-                docker_status = "❌ **Docker is not available** - Please install and start Docker Desktop"
-            
-            gr.Markdown(docker_status)
+            gr.Markdown(self.docker_status)
+        
+        # Let independent requests run concurrently instead of one at a time.
+        # Handlers are synchronous, so Gradio runs them on worker threads and
+        # CPU-bound work like validation never blocks its event loop.
+        app.queue(default_concurrency_limit=4, max_size=64)
         
         return app
 
@@ -422,6 +494,13 @@ def main():
     """Main function to run the application."""
     print("🚀 Starting Python Code Converter...")
     
+    # Full conversion tracebacks go to a log file rather than the UI; the root
+    # logger is left alone so library warnings still reach the console
+    log_handler = RotatingFileHandler("codebridge.log", maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(log_handler)
+    logger.setLevel(logging.INFO)
+    
     # Check dependencies
     try:
         import torch
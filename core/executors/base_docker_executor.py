@@ -1,13 +1,48 @@
+import atexit
 import docker
+import functools
+import threading
 import time
 import tempfile
 import shutil
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
 from .base_executor import BaseExecutor, ExecutionResult
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Container output kept per execution; anything beyond is dropped
+MAX_LOG_BYTES = 1_000_000
+
+# Keep-alive connections to the Docker daemon shared by concurrent executions
+DOCKER_POOL_SIZE = 32
+
+# Host ramdisk for execution scratch files (Linux only)
+_RAMDISK_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only mapping proxies."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path: str) -> MappingProxyType:
+    """Parse a configuration file once per process and share the read-only result."""
+    data = Path(config_path).read_bytes()
+    return _freeze(orjson.loads(data) if orjson else json.loads(data))
+
 
 class BaseDockerExecutor(BaseExecutor):
     """Base class for Docker-based code execution with shared functionality."""
@@ -15,26 +50,38 @@ class BaseDockerExecutor(BaseExecutor):
     def __init__(self, config_path: str = None):
         self.client = None
         self.config = self._load_config(config_path)
+        self._supported_languages = list(self.config['languages'].keys())
+        # Long-lived containers per language: {language: (container, scratch_dir)}
+        self._warm_containers = {}
+        self._warm_locks = {}
+        # Images already confirmed present in this process
+        self._available_images = set()
+        self._image_locks = {}
+        # Host directories with pre-built project files per language (None if unused)
+        self._templates = {}
+        self._template_lock = threading.Lock()
         self._initialize_docker()
+        atexit.register(self.close)
     
-    def _load_config(self, config_path: str = None) -> Dict[str, Any]:
-        """Load configuration from JSON file."""
+    def _load_config(self, config_path: str = None) -> Mapping[str, Any]:
+        """Load configuration from JSON file (parsed once per path and shared read-only)."""
         if config_path is None:
             current_dir = Path(__file__).parent.parent.parent
             config_path = current_dir / "config" / "language_config.json"
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_config_cached(str(config_path))
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in configuration file: {e}")
     
     def _initialize_docker(self):
-        """Initialize Docker client."""
+        """Initialize the Docker client shared by all executions."""
         try:
-            self.client = docker.from_env()
+            # Each run holds two connections at once (wait + log stream); size the
+            # keep-alive pool so concurrent runs reuse sockets instead of discarding them
+            self.client = docker.from_env(max_pool_size=DOCKER_POOL_SIZE)
             self.client.ping()
         except Exception as e:
             print(f"Docker initialization failed: {e}")
@@ -44,21 +91,47 @@ class BaseDockerExecutor(BaseExecutor):
         """Check if Docker is available."""
         return self.client is not None
     
+    def close(self):
+        """Remove warm containers and close the shared Docker client."""
+        if self.client is None:
+            return
+        
+        self._shutdown_warm_pool()
+        for template_dir in self._templates.values():
+            self._cleanup_temp_directory(template_dir)
+        self._templates.clear()
+        
+        try:
+            self.client.close()
+        except Exception:
+            pass
+        self.client = None
+    
     def _ensure_image_available(self, image: str):
         """Ensure Docker image is available, pull if necessary."""
-        try:
-            self.client.images.get(image)
-        except docker.errors.ImageNotFound:
-            print(f"Pulling Docker image: {image}")
-            self.client.images.pull(image)
+        if image in self._available_images:
+            return
+        
+        # Concurrent callers (startup prefetch, user runs) wait for a single pull
+        with self._image_locks.setdefault(image, threading.Lock()):
+            if image in self._available_images:
+                return
+            
+            try:
+                self.client.images.get(image)
+            except docker.errors.ImageNotFound:
+                print(f"Pulling Docker image: {image}")
+                self.client.images.pull(image)
+            
+            self._available_images.add(image)
     
-    def _create_container(self, image: str, command: str, temp_dir: str, working_dir: str) -> object:
+    def _create_container(self, image: str, command: List[str], temp_dir: str, working_dir: str) -> object:
         """
         Create and start a Docker container.
         
         Args:
             image: Docker image name
-            command: Command to execute
+            command: Command and its arguments
             temp_dir: Host temporary directory
             working_dir: Container working directory
             
@@ -67,11 +140,15 @@ class BaseDockerExecutor(BaseExecutor):
         """
         docker_config = self.config['docker']
         
+        # Scratch files written outside the bind mount (e.g. dotnet's /tmp) stay in RAM
+        tmpfs = {} if working_dir == '/tmp' else {'/tmp': f"size={docker_config.get('tmpfs_size', '256m')}"}
+        
         return self.client.containers.run(
             image=image,
             command=command,
             volumes={temp_dir: {'bind': working_dir, 'mode': 'rw'}},
             working_dir=working_dir,
+            tmpfs=tmpfs,
             detach=True,
             remove=False,
             mem_limit=docker_config.get('memory_limit', '512m'),
@@ -80,10 +157,31 @@ class BaseDockerExecutor(BaseExecutor):
             network_disabled=docker_config.get('network_disabled', True)
         )
     
+    def _collect_logs(self, container: object, buffer: bytearray):
+        """Append streamed container output to buffer until the container exits."""
+        try:
+            for chunk in container.logs(stdout=True, stderr=True, stream=True, follow=True):
+                # Keep draining past the cap so the stream can finish
+                if len(buffer) <= MAX_LOG_BYTES:
+                    buffer.extend(chunk)
+        except Exception:
+            pass
+    
+    def _decode_logs(self, raw: bytes) -> str:
+        """Decode container output, tolerating invalid UTF-8 and capping its size."""
+        if len(raw) <= MAX_LOG_BYTES:
+            return raw.decode('utf-8', errors='replace')
+        
+        logs = raw[:MAX_LOG_BYTES].decode('utf-8', errors='replace')
+        return f"{logs}\n... [output truncated after {MAX_LOG_BYTES:,} bytes]"
+    
     def _wait_for_container(self, container: object, timeout: int) -> ExecutionResult:
         """
         Wait for container completion and collect results.
         
+        Output is streamed into a buffer while the container runs, so no
+        separate log fetch is needed once it exits.
+        
         Args:
             container: Docker container object
             timeout: Timeout in seconds
@@ -93,14 +191,20 @@ class BaseDockerExecutor(BaseExecutor):
         """
         start_time = time.time()
         
+        log_buffer = bytearray()
+        log_thread = threading.Thread(target=self._collect_logs, args=(container, log_buffer), daemon=True)
+        log_thread.start()
+        
         try:
             # Wait for completion
             exit_info = container.wait(timeout=timeout)
             exit_code = exit_info['StatusCode']
             
-            logs = container.logs(stdout=True, stderr=True).decode('utf-8')
-            
             execution_time = time.time() - start_time
+            
+            log_thread.join(timeout=5)
+            logs = self._decode_logs(bytes(log_buffer))
+            
             success = exit_code == 0
             
             if success:
@@ -121,12 +225,8 @@ class BaseDockerExecutor(BaseExecutor):
         except Exception as e:
             execution_time = time.time() - start_time
             
-            # Try to get logs if possible
-            logs = ""
-            try:
-                logs = container.logs(stdout=True, stderr=True).decode('utf-8')
-            except Exception:
-                pass
+            # Report whatever output was captured before the failure
+            logs = self._decode_logs(bytes(log_buffer))
             
             return ExecutionResult(
                 success=False,
@@ -145,17 +245,182 @@ class BaseDockerExecutor(BaseExecutor):
         except Exception:
             pass
     
+    def _get_template_dir(self, language: str, strategy) -> Optional[str]:
+        """
+        Get the language's pre-built project template, building it on first use.
+        
+        Args:
+            language: Programming language name
+            strategy: Language strategy providing the template command
+            
+        Returns:
+            Optional[str]: Host template directory, or None if the language has none
+        """
+        if language in self._templates:
+            return self._templates[language]
+        
+        command = strategy.get_template_command()
+        if command is None:
+            self._templates[language] = None
+            return None
+        
+        with self._template_lock:
+            if language not in self._templates:
+                template_dir = self._create_temp_directory()
+                strategy.prepare_template(template_dir)
+                
+                try:
+                    container = self._create_container(
+                        image=strategy.get_image(),
+                        command=command,
+                        temp_dir=template_dir,
+                        working_dir=strategy.get_working_dir()
+                    )
+                except Exception as e:
+                    # Run without a template this time and retry on the next execution
+                    print(f"Failed to start {language} project template build: {e}")
+                    self._cleanup_temp_directory(template_dir)
+                    return None
+                
+                result = self._wait_for_container(container, strategy.get_timeout())
+                
+                if not result.success:
+                    print(f"Failed to build {language} project template: {result.error}")
+                    self._cleanup_temp_directory(template_dir)
+                    template_dir = None
+                
+                self._templates[language] = template_dir
+            
+            return self._templates[language]
+    
+    def _seed_from_template(self, language: str, strategy, temp_dir: str):
+        """Copy the language's pre-built project files into an execution directory."""
+        template_dir = self._get_template_dir(language, strategy)
+        if template_dir:
+            shutil.copytree(template_dir, temp_dir, dirs_exist_ok=True)
+    
+    def _use_warm_pool(self) -> bool:
+        """Check if executions should reuse long-lived containers."""
+        return self.config['docker'].get('warm_pool', False)
+    
+    def _get_warm_lock(self, language: str) -> threading.Lock:
+        """Get the lock serializing executions in a language's warm container."""
+        return self._warm_locks.setdefault(language, threading.Lock())
+    
+    def _get_warm_container(self, language: str, image: str, working_dir: str) -> tuple:
+        """
+        Get the warm container for a language, starting it on first use.
+        
+        Args:
+            language: Programming language name
+            image: Docker image name
+            working_dir: Container working directory
+            
+        Returns:
+            tuple: (container, host scratch directory mounted at working_dir)
+        """
+        if language not in self._warm_containers:
+            scratch_dir = self._create_temp_directory()
+            container = self._create_container(
+                image=image,
+                command=["tail", "-f", "/dev/null"],
+                temp_dir=scratch_dir,
+                working_dir=working_dir
+            )
+            self._warm_containers[language] = (container, scratch_dir)
+        
+        return self._warm_containers[language]
+    
+    def _discard_warm_container(self, language: str):
+        """Remove a language's warm container so the next run starts a fresh one."""
+        entry = self._warm_containers.pop(language, None)
+        if entry:
+            container, scratch_dir = entry
+            self._cleanup_container(container)
+            self._cleanup_temp_directory(scratch_dir)
+    
+    def _shutdown_warm_pool(self):
+        """Remove all warm containers."""
+        for language in list(self._warm_containers):
+            self._discard_warm_container(language)
+    
+    def _exec_stages(self, container: object, commands: list, timeout: int, working_dir: str) -> ExecutionResult:
+        """
+        Run commands one after another inside a running container.
+        
+        Stops at the first failing stage, so compile errors are reported
+        without attempting the run step. The timeout covers all stages.
+        
+        Args:
+            container: Running Docker container object
+            commands: Commands to execute in order (e.g. compile, run)
+            timeout: Timeout in seconds
+            working_dir: Container working directory
+            
+        Returns:
+            ExecutionResult: Execution result with the last stage's output
+        """
+        start_time = time.time()
+        logs = ""
+        
+        for command in commands:
+            remaining = int(timeout - (time.time() - start_time))
+            if remaining <= 0:
+                exit_code = 137
+                break
+            
+            # exec_run has no timeout of its own; coreutils timeout kills the whole process group
+            exit_code, output = container.exec_run(["timeout", "-s", "KILL", str(remaining)] + command, workdir=working_dir)
+            logs = self._decode_logs(output or b"")
+            
+            if exit_code != 0:
+                break
+        
+        execution_time = time.time() - start_time
+        
+        if exit_code == 0:
+            return ExecutionResult(
+                success=True,
+                output=logs,
+                error="",
+                execution_time=execution_time
+            )
+        
+        if exit_code == 137 and execution_time >= timeout - 1:
+            logs = f"Execution timed out after {timeout}s.\n{logs}"
+        
+        return ExecutionResult(
+            success=False,
+            output="",
+            error=logs,
+            execution_time=execution_time
+        )
+    
+    def _clear_directory(self, path: str):
+        """Remove the contents of a directory, keeping the directory itself."""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.unlink(entry.path)
+                except Exception:
+                    pass
+    
     def _create_temp_directory(self) -> str:
-        """Create temporary directory for code execution."""
-        return tempfile.mkdtemp()
+        """
+        Create temporary directory for code execution.
+        
+        Uses the /dev/shm ramdisk when the host has one, so source files and
+        compiler output never touch the disk.
+        """
+        return tempfile.mkdtemp(dir=_RAMDISK_DIR)
     
     def _cleanup_temp_directory(self, temp_dir: str):
         """Clean up temporary directory."""
-        try:
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-        except Exception:
-            pass
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
     
     def _handle_execution_error(self, error: Exception, execution_time: float) -> ExecutionResult:
         """
@@ -189,7 +454,7 @@ class BaseDockerExecutor(BaseExecutor):
     
     def get_supported_languages(self) -> list:
         """Get list of supported programming languages."""
-        return list(self.config['languages'].keys())
+        return list(self._supported_languages)
     
     def get_language_config(self, language: str) -> Dict[str, Any]:
         """
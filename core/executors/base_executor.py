@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
+import json
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class ExecutionResult:
     """Container for execution results."""
+    
+    __slots__ = ('output', 'error', 'execution_time', 'success')
 
     def __init__(self, success: bool, output: str, error: str, execution_time: float):
         self.output = output
@@ -20,22 +28,28 @@ class ExecutionResult:
             "execution_time": self.execution_time
         }
     
+    def to_json(self) -> bytes:
+        """Serialize the result to UTF-8 encoded JSON."""
+        if orjson:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8')
+    
     def format_result(self) -> str:
         """Format result for display."""
-        result = f"⏱️ Execution Time: {self.execution_time:.3f}s\n\n"
+        parts = [f"⏱️ Execution Time: {self.execution_time:.3f}s\n\n"]
         
         if self.success:
-            result += "✅ **Execution Successful**\n\n"
+            parts.append("✅ **Execution Successful**\n\n")
             if self.output:
-                result += f"**Output:**\n{self.output}\n"
+                parts.append(f"**Output:**\n{self.output}\n")
             else:
-                result += "**Output:** (No output produced)\n"
+                parts.append("**Output:** (No output produced)\n")
         else:
-            result += "❌ **Execution Failed**\n\n"
+            parts.append("❌ **Execution Failed**\n\n")
             if self.error:
-                result += f"**Error:**\n{self.error}\n"
+                parts.append(f"**Error:**\n{self.error}\n")
         
-        return result
+        return "".join(parts)
 
 class BaseExecutor(ABC):
     @abstractmethod
@@ -1,4 +1,6 @@
+import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from .base_docker_executor import BaseDockerExecutor
 from .language_strategy import LanguageStrategyFactory
 from .base_executor import ExecutionResult
@@ -10,6 +12,11 @@ class DockerExecutor(BaseDockerExecutor):
     def __init__(self, config_path: str = None):
         super().__init__(config_path)
         self.strategy_factory = LanguageStrategyFactory()
+        # Digest of the source whose build output is in each warm container
+        self._warm_builds = {}
+        # Strategies and language info per lowercase language; configs never change
+        self._strategies = {}
+        self._language_info = {}
     
     def execute(self, code: str, language: str) -> ExecutionResult:
         """
@@ -35,18 +42,21 @@ class DockerExecutor(BaseDockerExecutor):
         
         try:
             # Get language configuration and strategy
-            language_config = self.get_language_config(language)
-            strategy = self.strategy_factory.create_strategy(language, language_config)
+            strategy = self._get_strategy(language)
             
-            temp_dir = self._create_temp_directory()
-            prep_info = strategy.prepare_code(code, temp_dir)
-            
-            command = strategy.get_execution_command(prep_info)
+            if self._use_warm_pool():
+                return self._execute_warm(code, language.lower(), strategy)
             
             # Ensure Docker image is available
             image = strategy.get_image()
             self._ensure_image_available(image)
             
+            temp_dir = self._create_temp_directory()
+            self._seed_from_template(language.lower(), strategy, temp_dir)
+            prep_info = strategy.prepare_code(code, temp_dir)
+            
+            command = strategy.get_execution_command(prep_info)
+            
             container = self._create_container(
                 image=image,
                 command=command,
@@ -76,6 +86,94 @@ class DockerExecutor(BaseDockerExecutor):
             if temp_dir:
                 self._cleanup_temp_directory(temp_dir)
     
+    def _execute_warm(self, code: str, language: str, strategy) -> ExecutionResult:
+        """
+        Execute code in the language's long-lived container.
+        
+        Runs for the same language are serialized, since they share the
+        container's working directory. Re-running the last successfully
+        executed source skips the build stages and reuses its output.
+        
+        Args:
+            code: Source code to execute
+            language: Lowercase programming language name
+            strategy: Language strategy for the code
+            
+        Returns:
+            ExecutionResult: Execution result with output, errors, and timing
+        """
+        image = strategy.get_image()
+        working_dir = strategy.get_working_dir()
+        self._ensure_image_available(image)
+        
+        with self._get_warm_lock(language):
+            container, scratch_dir = self._get_warm_container(language, image, working_dir)
+            
+            digest = hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+            reuse_build = self._warm_builds.pop(language, None) == digest
+            
+            try:
+                if not reuse_build:
+                    self._clear_directory(scratch_dir)
+                    self._seed_from_template(language, strategy, scratch_dir)
+                prep_info = strategy.prepare_code(code, scratch_dir)
+                commands = strategy.get_execution_stages(prep_info)
+                if reuse_build:
+                    commands = commands[-1:]
+                
+                result = self._exec_stages(container, commands, strategy.get_timeout(), working_dir)
+            except ValueError:
+                raise
+            except Exception:
+                # The container may have died; start a fresh one next time
+                self._discard_warm_container(language)
+                raise
+            
+            if result.success:
+                self._warm_builds[language] = digest
+            return result
+    
+    def prefetch_images(self, timeout: float = 60.0) -> list:
+        """
+        Pull the images of all supported languages in parallel.
+        
+        Pulls still running after the timeout continue in the background.
+        
+        Args:
+            timeout: Seconds to wait for the pulls to finish
+            
+        Returns:
+            list: Images confirmed available when the wait ended
+        """
+        if not self.is_available():
+            return []
+        
+        images = {self.get_language_config(language)['image'] for language in self.get_supported_languages()}
+        if not images:
+            return []
+        
+        pool = ThreadPoolExecutor(max_workers=len(images))
+        futures = {pool.submit(self._ensure_image_available, image): image for image in images}
+        done, _ = wait(futures, timeout=timeout)
+        pool.shutdown(wait=False)
+        
+        ready = []
+        for future in done:
+            if future.exception() is None:
+                ready.append(futures[future])
+            else:
+                print(f"Failed to pull Docker image {futures[future]}: {future.exception()}")
+        return ready
+    
+    def _get_strategy(self, language: str):
+        """Get the cached strategy for a language, creating it on first use."""
+        key = language.lower()
+        strategy = self._strategies.get(key)
+        if strategy is None:
+            strategy = self.strategy_factory.create_strategy(key, self.get_language_config(key))
+            self._strategies[key] = strategy
+        return strategy
+    
     def get_language_info(self, language: str) -> dict:
         """
         Get information about a specific language.
@@ -86,20 +184,24 @@ class DockerExecutor(BaseDockerExecutor):
         Returns:
             dict: Language information including image, commands, etc.
         """
-        try:
-            config = self.get_language_config(language)
-            strategy = self.strategy_factory.create_strategy(language, config)
-            
-            return {
-                'language': language,
-                'image': strategy.get_image(),
-                'working_dir': strategy.get_working_dir(),
-                'timeout': strategy.get_timeout(),
-                'file_extension': config.get('file_extension', ''),
-                'project_based': config.get('project_based', False)
-            }
-        except Exception as e:
-            return {'error': str(e)}
+        info = self._language_info.get(language.lower())
+        if info is None:
+            try:
+                strategy = self._get_strategy(language)
+                config = strategy.config
+                
+                info = {
+                    'image': strategy.get_image(),
+                    'working_dir': strategy.get_working_dir(),
+                    'timeout': strategy.get_timeout(),
+                    'file_extension': config.get('file_extension', ''),
+                    'project_based': config.get('project_based', False)
+                }
+            except Exception as e:
+                return {'error': str(e)}
+            self._language_info[language.lower()] = info
+        
+        return {'language': language, **info}
     
     def validate_language_support(self, language: str) -> bool:
         """
@@ -111,8 +213,4 @@ class DockerExecutor(BaseDockerExecutor):
         Returns:
             bool: True if supported, False otherwise
         """
-        try:
-            self.get_language_config(language)
-            return True
-        except ValueError:
-            return False
\ No newline at end of file
+        return language.lower() in self.config['languages']
\ No newline at end of file
@@ -1,6 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import os
+import re
+import shlex
+import textwrap
+from ..utils.cache import LRUCache
+from ..utils.file_utils import FileManager
+
+
+_PUBLIC_CLASS_RE = re.compile(r'public\s+class\s+(\w+)')
+_ANY_CLASS_RE = re.compile(r'class\s+(\w+)')
+
+# Java class names by source digest, so large sources are not kept alive
+_class_name_cache = LRUCache(max_size=128)
+
+
+def _write_source(path: str, content: str):
+    """Write content to path as UTF-8 with unbuffered os-level writes."""
+    _write_bytes(path, content.encode('utf-8'))
+
+
+def _write_bytes(path: str, content: bytes):
+    """Write already-encoded content to path with unbuffered os-level writes."""
+    FileManager.write_bytes(path, content)
 
 
 class LanguageStrategy(ABC):
@@ -24,7 +46,7 @@ class LanguageStrategy(ABC):
         pass
     
     @abstractmethod
-    def get_execution_command(self, prep_info: Dict[str, str]) -> str:
+    def get_execution_command(self, prep_info: Dict[str, str]) -> List[str]:
         """
         Get the command to execute in Docker container.
         
@@ -32,10 +54,39 @@ class LanguageStrategy(ABC):
             prep_info: Information from prepare_code step
             
         Returns:
-            str: Command to execute
+            List[str]: Command and its arguments
         """
         pass
     
+    def get_execution_stages(self, prep_info: Dict[str, str]) -> List[List[str]]:
+        """
+        Get the commands to execute one after another, e.g. compile then run.
+        
+        Args:
+            prep_info: Information from prepare_code step
+            
+        Returns:
+            List[List[str]]: Commands to execute in order
+        """
+        return [self.get_execution_command(prep_info)]
+    
+    def get_template_command(self) -> Optional[List[str]]:
+        """
+        Get a command that pre-builds reusable project files, if the language has any.
+        
+        The command runs once in a directory set up by prepare_template; the
+        resulting files are copied into each execution's directory before
+        prepare_code.
+        
+        Returns:
+            Optional[List[str]]: Command to execute, or None if no template is used
+        """
+        return None
+    
+    def prepare_template(self, template_dir: str):
+        """Write the files get_template_command operates on."""
+        pass
+    
     def get_image(self) -> str:
         """Get Docker image for this language."""
         return self.config['image']
@@ -57,8 +108,7 @@ class CppStrategy(LanguageStrategy):
         filename = "code.cpp"
         filepath = os.path.join(temp_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(code)
+        _write_source(filepath, code)
         
         return {
             'filename': filename,
@@ -66,11 +116,15 @@ class CppStrategy(LanguageStrategy):
             'run_cmd': self.config['run_command']
         }
     
-    def get_execution_command(self, prep_info: Dict[str, str]) -> str:
+    def get_execution_command(self, prep_info: Dict[str, str]) -> List[str]:
         """Get C++ execution command."""
         compile_cmd = prep_info['compile_cmd']
         run_cmd = prep_info['run_cmd']
-        return f"bash -c '{compile_cmd} && {run_cmd}'"
+        return ["sh", "-c", f"{compile_cmd} && {run_cmd}"]
+    
+    def get_execution_stages(self, prep_info: Dict[str, str]) -> List[List[str]]:
+        """Get separate C++ compile and run commands, run without a shell."""
+        return [shlex.split(prep_info['compile_cmd']), shlex.split(prep_info['run_cmd'])]
 
 
 class JavaStrategy(LanguageStrategy):
@@ -85,8 +139,7 @@ class JavaStrategy(LanguageStrategy):
         filename = f"{class_name}.java"
         filepath = os.path.join(temp_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(code)
+        _write_source(filepath, code)
         
         compile_cmd = self.config['compile_command'].format(class_name=class_name)
         run_cmd = self.config['run_command'].format(class_name=class_name)
@@ -98,66 +151,87 @@ class JavaStrategy(LanguageStrategy):
             'run_cmd': run_cmd
         }
     
-    def get_execution_command(self, prep_info: Dict[str, str]) -> str:
+    def get_execution_command(self, prep_info: Dict[str, str]) -> List[str]:
         """Get Java execution command."""
         compile_cmd = prep_info['compile_cmd']
         run_cmd = prep_info['run_cmd']
-        return f"bash -c '{compile_cmd} && {run_cmd}'"
+        return ["sh", "-c", f"{compile_cmd} && {run_cmd}"]
+    
+    def get_execution_stages(self, prep_info: Dict[str, str]) -> List[List[str]]:
+        """Get separate Java compile and run commands, run without a shell."""
+        return [shlex.split(prep_info['compile_cmd']), shlex.split(prep_info['run_cmd'])]
     
     def _extract_class_name(self, code: str) -> str:
         """Extract class name from Java code."""
-        import re
+        cache_key = LRUCache.make_key(code)
+        class_name = _class_name_cache.get(cache_key)
+        if class_name is not None:
+            return class_name
         
-        # Look for public class first
-        pattern = r'public\s+class\s+(\w+)'
-        match = re.search(pattern, code)
-        if match:
-            return match.group(1)
+        # Look for public class first, then fall back to any class
+        match = _PUBLIC_CLASS_RE.search(code) or _ANY_CLASS_RE.search(code)
+        class_name = match.group(1) if match else ""
         
-        # Fallback to any class
-        pattern = r'class\s+(\w+)'
-        match = re.search(pattern, code)
-        if match:
-            return match.group(1)
-        
-        return ""
+        _class_name_cache.set(cache_key, class_name)
+        return class_name
 
 
 class CsharpStrategy(LanguageStrategy):
     """Strategy for C# code execution."""
     
+    _CSPROJ = """<Project Sdk="Microsoft.NET.Sdk">
+  <PropertyGroup>
+    <OutputType>Exe</OutputType>
+    <TargetFramework>net8.0</TargetFramework>
+    <ImplicitUsings>enable</ImplicitUsings>
+    <Nullable>disable</Nullable>
+    <TreatWarningsAsErrors>false</TreatWarningsAsErrors>
+  </PropertyGroup>
+</Project>"""
+    _CSPROJ_BYTES = _CSPROJ.encode('utf-8')
+    
     def prepare_code(self, code: str, temp_dir: str) -> Dict[str, str]:
         """Prepare C# code with proper project structure."""
         # Wrap code if needed
         program_cs_content = self._wrap_code(code)
         
         program_file = os.path.join(temp_dir, "Program.cs")
-        with open(program_file, 'w', encoding='utf-8') as f:
-            f.write(program_cs_content)
-        
-        # Create project file
-        csproj_content = '''<Project Sdk="Microsoft.NET.Sdk">
-        <PropertyGroup>
-            <OutputType>Exe</OutputType>
-            <TargetFramework>net8.0</TargetFramework>
-            <ImplicitUsings>enable</ImplicitUsings>
-            <Nullable>disable</Nullable>
-            <TreatWarningsAsErrors>false</TreatWarningsAsErrors>
-        </PropertyGroup>
-        </Project>'''
-        
-        csproj_file = os.path.join(temp_dir, "Program.csproj")
-        with open(csproj_file, 'w', encoding='utf-8') as f:
-            f.write(csproj_content)
+        _write_source(program_file, program_cs_content)
+        
+        self._write_project_file(temp_dir)
+        
+        # Packages restored by the template can be reused as-is
+        restored = os.path.exists(os.path.join(temp_dir, "obj", "project.assets.json"))
         
         return {
             'filename': 'Program.cs',
-            'project_file': 'Program.csproj'
+            'project_file': 'Program.csproj',
+            'restore_flag': ' --no-restore' if restored else ''
         }
     
-    def get_execution_command(self, prep_info: Dict[str, str]) -> str:
+    def get_execution_command(self, prep_info: Dict[str, str]) -> List[str]:
         """Get C# execution command."""
-        return "bash -c 'dotnet run'"
+        return ["dotnet", "run"] + prep_info.get('restore_flag', '').split()
+    
+    def get_execution_stages(self, prep_info: Dict[str, str]) -> List[List[str]]:
+        """Get separate C# build and run commands."""
+        return [
+            ["dotnet", "build", "-nologo", "-v", "q"] + prep_info.get('restore_flag', '').split(),
+            ["dotnet", "run", "--no-build"]
+        ]
+    
+    def get_template_command(self) -> Optional[List[str]]:
+        """Restore the project's packages once so executions can skip it."""
+        return ["dotnet", "restore"]
+    
+    def prepare_template(self, template_dir: str):
+        """Write the project file and a stub program to restore against."""
+        _write_source(os.path.join(template_dir, "Program.cs"), "")
+        self._write_project_file(template_dir)
+    
+    def _write_project_file(self, temp_dir: str):
+        """Write the console project file."""
+        _write_bytes(os.path.join(temp_dir, "Program.csproj"), self._CSPROJ_BYTES)
     
     def _wrap_code(self, code: str) -> str:
         """Wrap C# code in proper Main method if needed."""
@@ -187,9 +261,7 @@ class CsharpStrategy(LanguageStrategy):
     
     def _indent_code(self, code: str, spaces: int) -> str:
         """Indent code by specified number of spaces."""
-        indent = " " * spaces
-        lines = code.split('\n')
-        return '\n'.join(indent + line if line.strip() else line for line in lines)
+        return textwrap.indent(code, " " * spaces, predicate=str.strip)
 
 
 class LanguageStrategyFactory:
@@ -1,17 +1,103 @@
 import subprocess
 import sys
+import threading
 import time
 from io import StringIO
 from contextlib import redirect_stdout, redirect_stderr
 from .base_executor import BaseExecutor, ExecutionResult
 from ..utils.file_utils import FileManager
+from ..utils.cache import LRUCache
+
+
+# Bootstrap for execute_file's interpreters. Each process is started ahead of
+# time, waits for the path of a script on stdin, runs it once like
+# `python script.py` would and exits, so no state carries over between runs.
+_WORKER_SOURCE = r"""
+import os, sys, traceback
+
+path = sys.stdin.readline().rstrip('\n')
+if not path:
+    sys.exit(0)
+sys.stdin = open(os.devnull)
+sys.argv = [path]
+sys.path[0] = os.path.dirname(path)
+
+with open(path, 'rb') as source:
+    code = compile(source.read(), path, 'exec')
+
+try:
+    exec(code, {'__name__': '__main__', '__file__': path, '__builtins__': __builtins__})
+except SystemExit:
+    raise
+except BaseException:
+    # Report the error like the interpreter would, without this bootstrap's frame
+    error_type, error, tb = sys.exc_info()
+    traceback.print_exception(error_type, error, tb.tb_next)
+    sys.exit(1)
+"""
+
 
 class PythonExecutor(BaseExecutor):
     """Executor for running Python code."""
     
+    # Builtins available to code run by execute(); copied per run so user code cannot alter it
+    _SAFE_BUILTINS = {
+        # Essential functions
+        'print': print,
+        'len': len,
+        'range': range,
+        'list': list,
+        'dict': dict,
+        'tuple': tuple,
+        'set': set,
+        'str': str,
+        'int': int,
+        'float': float,
+        'bool': bool,
+        'max': max,
+        'min': min,
+        'sum': sum,
+        'sorted': sorted,
+        'enumerate': enumerate,
+        'zip': zip,
+        'abs': abs,
+        'round': round,
+        
+        # Class and object support
+        '__build_class__': __build_class__,
+        'type': type,
+        'object': object,
+        'property': property,
+        'staticmethod': staticmethod,
+        'classmethod': classmethod,
+        'super': super,
+        'isinstance': isinstance,
+        'issubclass': issubclass,
+        'hasattr': hasattr,
+        'getattr': getattr,
+        'setattr': setattr,
+        'delattr': delattr,
+        
+        # Flow control
+        'iter': iter,
+        'next': next,
+        'any': any,
+        'all': all,
+        
+        # Common constants
+        'None': None,
+        'True': True,
+        'False': False,
+        '__name__': '__main__',
+    }
+    
     def __init__(self):
         self.file_manager = FileManager()
-        
+        # Interpreter started ahead of time for the next execute_file run
+        self._spare_worker = None
+        self._worker_lock = threading.Lock()
+        # Compiled code objects for recently executed sources
+        self._code_cache = LRUCache(max_size=64)
 
     def execute(self, code: str) -> ExecutionResult:
         """
@@ -30,61 +116,11 @@ class PythonExecutor(BaseExecutor):
             stdout_capture = StringIO()
             stderr_capture = StringIO()
             
-            # Create a restricted global environment
-            safe_globals = {
-                '__builtins__': {
-                    # Essential functions
-                    'print': print,
-                    'len': len,
-                    'range': range,
-                    'list': list,
-                    'dict': dict,
-                    'tuple': tuple,
-                    'set': set,
-                    'str': str,
-                    'int': int,
-                    'float': float,
-                    'bool': bool,
-                    'max': max,
-                    'min': min,
-                    'sum': sum,
-                    'sorted': sorted,
-                    'enumerate': enumerate,
-                    'zip': zip,
-                    'abs': abs,
-                    'round': round,
-                    
-                    # Class and object support
-                    '__build_class__': __build_class__,
-                    'type': type,
-                    'object': object,
-                    'property': property,
-                    'staticmethod': staticmethod,
-                    'classmethod': classmethod,
-                    'super': super,
-                    'isinstance': isinstance,
-                    'issubclass': issubclass,
-                    'hasattr': hasattr,
-                    'getattr': getattr,
-                    'setattr': setattr,
-                    'delattr': delattr,
-                    
-                    # Flow control
-                    'iter': iter,
-                    'next': next,
-                    'any': any,
-                    'all': all,
-                    
-                    # Common constants
-                    'None': None,
-                    'True': True,
-                    'False': False,
-                    '__name__': '__main__',
-                }
-            }
+            # Restricted global environment with a private copy of the builtins
+            safe_globals = {'__builtins__': dict(self._SAFE_BUILTINS)}
             
             with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(code, safe_globals)
+                exec(self._compile(code), safe_globals)
             
             execution_time = time.time() - start_time
             
@@ -109,11 +145,24 @@ class PythonExecutor(BaseExecutor):
                 execution_time=execution_time
             )
     
+    def _compile(self, code: str):
+        """Compile code for exec(), reusing the code object for recently seen sources."""
+        cache_key = LRUCache.make_key(code)
+        code_obj = self._code_cache.get(cache_key)
+        if code_obj is None:
+            code_obj = compile(code, '<string>', 'exec')
+            self._code_cache.set(cache_key, code_obj)
+        return code_obj
+    
     def execute_file(self, code: str) -> ExecutionResult:
         """
         Execute Python code by creating a temporary file.
         Alternative method for complex code that might not work with exec().
         
+        Each run gets a fresh interpreter, but the next one is started as
+        soon as a run begins, so interpreter start-up overlaps with idle time
+        instead of delaying the run.
+        
         Args:
             code: Python code to execute
             
@@ -121,28 +170,27 @@ class PythonExecutor(BaseExecutor):
             ExecutionResult: Execution result
         """
         temp_file = None
+        worker = None
         start_time = time.time()
         
         try:
             # Create temporary Python file
             temp_file = self.file_manager.create_temp_file(code, '.py')
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            worker = self._take_worker()
+            stdout, stderr = worker.communicate(temp_file + '\n', timeout=30)
             
             execution_time = time.time() - start_time
             
             return ExecutionResult(
-                success=result.returncode == 0,
-                output=result.stdout,
-                error=result.stderr,
+                success=worker.returncode == 0,
+                output=stdout,
+                error=stderr,
                 execution_time=execution_time
             )
             
         except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.communicate()
             execution_time = time.time() - start_time
             return ExecutionResult(
                 success=False,
@@ -162,6 +210,25 @@ class PythonExecutor(BaseExecutor):
             if temp_file:
                 self.file_manager.cleanup_temp_file(temp_file)
     
+    def _start_worker(self) -> subprocess.Popen:
+        """Start an interpreter that waits for a script to run."""
+        return subprocess.Popen(
+            [sys.executable, "-c", _WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    
+    def _take_worker(self) -> subprocess.Popen:
+        """Take the spare interpreter for a run and start its replacement."""
+        with self._worker_lock:
+            worker = self._spare_worker
+            if worker is None or worker.poll() is not None:
+                worker = self._start_worker()
+            self._spare_worker = self._start_worker()
+        return worker
+    
     def is_available(self) -> bool:
         """Python executor is always available."""
         return True
\ No newline at end of file
@@ -1,10 +1,27 @@
 """
 Model implementations for different AI services.
+
+Model classes are imported on first access, so only the SDKs of the
+models actually used get loaded.
 """
 
 from .base_model import BaseCodeModel
-from .qwen_model import QwenModel
-from .openai_model import OpenAIModel
-from .claude_model import ClaudeModel
 
-__all__ = ['BaseCodeModel', 'QwenModel', 'OpenAIModel', 'ClaudeModel']
\ No newline at end of file
+_LAZY_MODELS = {
+    'QwenModel': '.qwen_model',
+    'OpenAIModel': '.openai_model',
+    'ClaudeModel': '.claude_model',
+    'VLLMQwenModel': '.vllm_qwen_model'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_MODELS:
+        import importlib
+        model_class = getattr(importlib.import_module(_LAZY_MODELS[name], __name__), name)
+        globals()[name] = model_class
+        return model_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['BaseCodeModel', 'QwenModel', 'OpenAIModel', 'ClaudeModel', 'VLLMQwenModel']
\ No newline at end of file
@@ -1,10 +1,30 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+# Streamed text is passed on at most this often, in seconds
+STREAM_YIELD_INTERVAL = 0.05
 
 
 class BaseCodeModel(ABC):
     """Abstract base class for code generation models."""
     
+    _PROMPT_TEMPLATE = """Convert the following Python code to {target_language}.{comments_instruction}
+Make sure the converted code:
+1. Maintains the same functionality
+2. Uses appropriate {target_language} conventions and syntax
+3. Handles edge cases properly
+4. Is compilable and runnable
+
+Python code:
+```python
+{python_code}
+```
+
+Please respond with ONLY the {target_language} code, no explanations or markdown formatting."""
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
     
@@ -32,20 +52,66 @@ class BaseCodeModel(ABC):
         """Check if the model is available and properly configured."""
         pass
     
+    def convert_codes(self, items: List[Tuple[str, str]], add_comments: bool = False, max_workers: int = 8) -> List[str]:
+        """
+        Convert several Python snippets concurrently.
+        
+        Args:
+            items: (python_code, target_language) pairs to convert
+            add_comments: Whether to add explanatory comments
+            max_workers: Maximum number of conversions in flight at once
+            
+        Returns:
+            List[str]: Converted code, in the same order as items
+            
+        Raises:
+            Exception: If any conversion fails
+        """
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            futures = [
+                pool.submit(self.convert_code, python_code, target_language, add_comments, False)
+                for python_code, target_language in items
+            ]
+            return [future.result() for future in futures]
+    
+    def _coalesce_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Turn streamed text chunks into updates of the full text so far.
+        
+        Chunks arriving within STREAM_YIELD_INTERVAL of the last update are
+        held back and joined into the next one, so the text is copied once
+        per update rather than once per chunk. The final text is always yielded.
+        
+        Args:
+            chunks: Text deltas in the order they were generated
+            
+        Yields:
+            str: Text generated so far
+        """
+        text = ""
+        pending = []
+        last_yield = time.monotonic()
+        for chunk in chunks:
+            pending.append(chunk)
+            now = time.monotonic()
+            if now - last_yield >= STREAM_YIELD_INTERVAL:
+                text += "".join(pending)
+                pending.clear()
+                last_yield = now
+                yield text
+        
+        if pending:
+            yield text + "".join(pending)
+    
     def _create_prompt(self, python_code: str, target_language: str, add_comments: bool) -> str:
         """Create a standardized prompt for code conversion."""
         comments_instruction = " Add detailed comments explaining the logic." if add_comments else ""
         
-        return f"""Convert the following Python code to {target_language}.{comments_instruction}
-            Make sure the converted code:
-            1. Maintains the same functionality
-            2. Uses appropriate {target_language} conventions and syntax
-            3. Handles edge cases properly
-            4. Is compilable and runnable
-
-            Python code:
-            ```python
-            {python_code}
-            ```
-
-            Please respond with ONLY the {target_language} code, no explanations or markdown formatting."""
\ No newline at end of file
+        return self._PROMPT_TEMPLATE.format(
+            target_language=target_language,
+            comments_instruction=comments_instruction,
+            python_code=python_code
+        )
@@ -1,6 +1,9 @@
-from anthropic import Anthropic
 from typing import Optional
 from .base_model import BaseCodeModel
+from .http_client import get_http_client
+
+
+SYSTEM_PROMPT = "You are an expert programmer."
 
 
 class ClaudeModel(BaseCodeModel):
@@ -8,9 +11,7 @@ class ClaudeModel(BaseCodeModel):
     
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
-        self.client = None
-        if api_key:
-            self.client = Anthropic(api_key=api_key)
+        self.client = self._create_client(api_key) if api_key else None
     
     def convert_code(self, python_code: str, target_language: str, add_comments: bool = False, stream: bool = False) -> str:
         """Convert Python code using Claude API."""
@@ -34,17 +35,15 @@ class ClaudeModel(BaseCodeModel):
             model="claude-sonnet-4-20250514",
             max_tokens=15000,
             temperature=0.1,
+            system=SYSTEM_PROMPT,
             messages=[
                 {
                     "role": "user",
-                    "content": f"You are an expert programmer. {prompt}"
+                    "content": prompt
                 }
             ]
         ) as stream:
-            generated_text = ""
-            for text in stream.text_stream:
-                generated_text += text
-                yield generated_text
+            yield from self._coalesce_stream(stream.text_stream)
     
     def _generate_complete(self, prompt):
         """Generate complete response at once."""
@@ -52,10 +51,11 @@ class ClaudeModel(BaseCodeModel):
             model="claude-sonnet-4-20250514",
             max_tokens=15000,
             temperature=0.1,
+            system=SYSTEM_PROMPT,
             messages=[
                 {
                     "role": "user",
-                    "content": f"You are an expert programmer. {prompt}"
+                    "content": prompt
                 }
             ]
         )
@@ -69,4 +69,9 @@ class ClaudeModel(BaseCodeModel):
     def update_api_key(self, api_key: str):
         """Update the API key and reinitialize client."""
         self.api_key = api_key
-        self.client = Anthropic(api_key=api_key) if api_key else None
\ No newline at end of file
+        self.client = self._create_client(api_key) if api_key else None
+    
+    def _create_client(self, api_key: str):
+        """Create the SDK client, importing the SDK on first use."""
+        from anthropic import Anthropic
+        return Anthropic(api_key=api_key, http_client=get_http_client())
\ No newline at end of file
@@ -0,0 +1,34 @@
+import threading
+
+# Keep-alive pool shared by the API model clients
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Get the process-wide HTTP client used by the API SDKs.
+    
+    Sharing one client keeps connections alive across requests and across
+    client re-creation when an API key changes.
+    
+    Returns:
+        httpx.Client: Shared HTTP client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                
+                _client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                    timeout=httpx.Timeout(600.0, connect=5.0)
+                )
+    return _client
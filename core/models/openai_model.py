@@ -1,6 +1,6 @@
-from openai import OpenAI
 from typing import Optional
 from .base_model import BaseCodeModel
+from .http_client import get_http_client
 
 
 class OpenAIModel(BaseCodeModel):
@@ -8,9 +8,7 @@ class OpenAIModel(BaseCodeModel):
     
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
-        self.client = None
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
+        self.client = self._create_client(api_key) if api_key else None
     
     def convert_code(self, python_code: str, target_language: str, add_comments: bool = False, stream: bool = False) -> str:
         """Convert Python code using OpenAI API."""
@@ -44,11 +42,12 @@ class OpenAIModel(BaseCodeModel):
             stream=True
         )
         
-        generated_text = ""
-        for chunk in stream:
-            if chunk.choices[0].delta.content is not None:
-                generated_text += chunk.choices[0].delta.content
-                yield generated_text
+        deltas = (
+            chunk.choices[0].delta.content
+            for chunk in stream
+            if chunk.choices[0].delta.content is not None
+        )
+        yield from self._coalesce_stream(deltas)
     
     def _generate_complete(self, prompt):
         """Generate complete response at once."""
@@ -74,4 +73,9 @@ class OpenAIModel(BaseCodeModel):
     def update_api_key(self, api_key: str):
         """Update the API key and reinitialize client."""
         self.api_key = api_key
-        self.client = OpenAI(api_key=api_key) if api_key else None
\ No newline at end of file
+        self.client = self._create_client(api_key) if api_key else None
+    
+    def _create_client(self, api_key: str):
+        """Create the SDK client, importing the SDK on first use."""
+        from openai import OpenAI
+        return OpenAI(api_key=api_key, http_client=get_http_client())
\ No newline at end of file
@@ -1,21 +1,82 @@
+import copy
+import os
+import queue
+import threading
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import AutoTokenizer, AutoModelForCausalLM, BatchEncoding, StoppingCriteria, StoppingCriteriaList
 from typing import Optional
 from .base_model import BaseCodeModel
+from ..utils.cache import LRUCache
+
+
+# Weight formats selectable through QWEN_QUANTIZATION
+QUANTIZATION_MODES = ("bf16", "int8", "nf4")
+
+SYSTEM_PROMPT = "You are an expert programmer skilled in converting code between different programming languages."
+
+# Prompts are truncated to this many tokens
+MAX_INPUT_TOKENS = 4096
+
+# Seconds to wait for the next streamed token, once generation holds the GPU, before giving up
+STREAM_TOKEN_TIMEOUT = 120.0
+
+# Stands in for the user code when locating it in a rendered prompt
+_CODE_SENTINEL = "\x00"
+
+# Prompt prefixes whose KV cache is kept (one per target language and comment setting)
+MAX_PREFIX_CACHES = 8
+
+# Seconds to wait for a stopped generation thread to finish its current step
+STREAM_STOP_TIMEOUT = 10.0
+
+# 4-bit KV cache used when KV-cache quantization is enabled (needs optimum-quanto)
+KV_CACHE_CONFIG = {"backend": "quanto", "nbits": 4}
+
+
+class _StopOnEvent(StoppingCriteria):
+    """Stops generate() once the event is set."""
+    
+    def __init__(self, event: threading.Event):
+        self.event = event
+    
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.event.is_set()
 
 
 class QwenModel(BaseCodeModel):
     """Qwen2.5-7B-Instruct local model implementation."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, quantization: Optional[str] = None, kv_quant: Optional[bool] = None, compile_model: Optional[bool] = None, static_cache: Optional[bool] = None):
         super().__init__(api_key)
         self.model = None
         self.tokenizer = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.quantization = (quantization or os.environ.get("QWEN_QUANTIZATION", "nf4")).lower()
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported Qwen quantization: {self.quantization}. Supported: {list(QUANTIZATION_MODES)}")
+        self.kv_quant = kv_quant if kv_quant is not None else os.environ.get("QWEN_KV_QUANT") == "1"
+        self.compile_model = compile_model if compile_model is not None else os.environ.get("QWEN_COMPILE") == "1"
+        # Preallocate the KV cache for the whole generation; a compiled model always does
+        self.static_cache = static_cache if static_cache is not None else os.environ.get("QWEN_STATIC_CACHE") == "1"
+        # Chat-formatted system turn and its token ids, shared by every prompt
+        self._system_text = None
+        self._system_ids = None
+        # KV cache of shared prompt prefixes, keyed by digest of the prefix text
+        self._prefix_caches = LRUCache(max_size=MAX_PREFIX_CACHES)
+        # One generation at a time on the GPU; concurrent requests wait their turn
+        self._gpu_lock = threading.Lock()
         self._load_model()
     
     def _load_model(self):
         """Load the Qwen model and tokenizer with quantization."""
+        if not torch.cuda.is_available():
+            print("CUDA is not available - skipping Qwen model load")
+            return
+        
+        # Let any float32 matmuls and convolutions run on tensor cores
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        
         try:
             model_name = "Qwen/Qwen2.5-7B-Instruct"
             
@@ -24,33 +85,75 @@ class QwenModel(BaseCodeModel):
                 trust_remote_code=True
             )
             
-            # Load model with quantization for memory efficiency
-            from transformers import BitsAndBytesConfig
-            
-            quantization_config = BitsAndBytesConfig(
-                load_in_4bit=True,
-                bnb_4bit_compute_dtype=torch.float16,
-                bnb_4bit_use_double_quant=True,
-                bnb_4bit_quant_type="nf4"
-            )
-            
             self.model = AutoModelForCausalLM.from_pretrained(
                 model_name,
-                torch_dtype=torch.float16,
+                torch_dtype=self._compute_dtype(),
                 device_map="auto",
                 trust_remote_code=True,
-                quantization_config=quantization_config,
+                quantization_config=self._create_quantization_config(),
+                attn_implementation=self._select_attn_implementation(),
                 low_cpu_mem_usage=True
             )
             
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
+            
+            self._system_text = self.tokenizer.apply_chat_template(
+                [{"role": "system", "content": SYSTEM_PROMPT}],
+                tokenize=False
+            )
+            self._system_ids = self.tokenizer(self._system_text, return_tensors="pt")["input_ids"]
+            
+            if self.compile_model:
+                self._compile_forward()
                 
         except Exception as e:
             print(f"Failed to load Qwen model: {e}")
             self.model = None
             self.tokenizer = None
     
+    def _compile_forward(self):
+        """Compile the forward pass with CUDA graphs so each decode step replays one graph."""
+        if self.kv_quant:
+            print("Qwen compilation skipped: not supported together with KV-cache quantization")
+            return
+        
+        try:
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead")
+            self.static_cache = True
+        except Exception as e:
+            print(f"Qwen compilation skipped: {e}")
+    
+    def _select_attn_implementation(self) -> str:
+        """Use FlashAttention-2 when flash-attn is installed, otherwise PyTorch's fused SDPA."""
+        from transformers.utils import is_flash_attn_2_available
+        
+        return "flash_attention_2" if is_flash_attn_2_available() else "sdpa"
+    
+    def _compute_dtype(self):
+        """Use bfloat16 on GPUs with native support (Ampere and newer), float16 otherwise."""
+        # is_bf16_supported() also reports emulated bf16 on Volta/Turing, which is slower than float16
+        if self.quantization == "bf16" or torch.cuda.get_device_capability()[0] >= 8:
+            return torch.bfloat16
+        return torch.float16
+    
+    def _create_quantization_config(self):
+        """Create the bitsandbytes config for the selected weight format, or None for bf16."""
+        if self.quantization == "bf16":
+            return None
+        
+        from transformers import BitsAndBytesConfig
+        
+        if self.quantization == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True)
+        
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=self._compute_dtype(),
+            bnb_4bit_use_double_quant=True,
+            bnb_4bit_quant_type="nf4"
+        )
+    
     def convert_code(self, python_code: str, target_language: str, add_comments: bool = False, stream: bool = False) -> str:
         """Convert Python code using Qwen model."""
         if not self.is_available():
@@ -59,7 +162,7 @@ class QwenModel(BaseCodeModel):
         prompt = self._create_prompt(python_code, target_language, add_comments)
         
         messages = [
-            {"role": "system", "content": "You are an expert programmer skilled in converting code between different programming languages."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
@@ -72,31 +175,139 @@ class QwenModel(BaseCodeModel):
                 )
             else:
                 # Fallback if apply_chat_template is not available
-                text = f"<|im_start|>system\nYou are an expert programmer skilled in converting code between different programming languages.<|im_end|>\n<|im_start|>user\n{prompt}<|im_end|>\n<|im_start|>assistant\n"
+                text = f"<|im_start|>system\n{SYSTEM_PROMPT}<|im_end|>\n<|im_start|>user\n{prompt}<|im_end|>\n<|im_start|>assistant\n"
             
             if not isinstance(text, str):
                 raise Exception(f"Chat template returned unexpected type: {type(text)}")
             
             try:
-                inputs = self.tokenizer(
-                    text,
-                    return_tensors="pt",
-                    truncation=True,
-                    max_length=4096,
-                    padding=False
-                ).to(self.device)
+                inputs = self._to_device(self._tokenize_prompt(text))
             except Exception as e:
                 raise Exception(f"Tokenization failed: {str(e)}. Input type: {type(text)}")
             
+            # Quantized and static caches are built by generate() itself, so prefix caches cannot seed them
+            past_key_values = None
+            if not (self.kv_quant or self.static_cache):
+                prefix_text = self._find_prompt_prefix(text, prompt, target_language, add_comments)
+                if prefix_text:
+                    past_key_values = self._get_prefix_cache(prefix_text, inputs["input_ids"])
+            
             if stream:
-                return self._generate_streaming(inputs)
+                return self._generate_streaming(inputs, past_key_values)
             else:
-                return self._generate_complete(inputs)
+                return self._generate_complete(inputs, past_key_values)
             
         except Exception as e:
             raise Exception(f"Qwen model generation failed: {str(e)}")
     
-    def _generate_streaming(self, inputs):
+    def _tokenize_prompt(self, text: str):
+        """
+        Tokenize a chat-formatted prompt, reusing the pre-tokenized system turn.
+        
+        The system turn ends before a special token, so tokenizing the rest
+        separately gives the same ids as tokenizing the whole prompt.
+        
+        Args:
+            text: Full chat-formatted prompt
+            
+        Returns:
+            BatchEncoding with input_ids and attention_mask on the CPU
+        """
+        if self._system_text is None or not text.startswith(self._system_text):
+            return self.tokenizer(
+                text,
+                return_tensors="pt",
+                truncation=True,
+                max_length=MAX_INPUT_TOKENS,
+                padding=False
+            )
+        
+        user_ids = self.tokenizer(text[len(self._system_text):], return_tensors="pt")["input_ids"]
+        input_ids = torch.cat([self._system_ids, user_ids], dim=1)[:, :MAX_INPUT_TOKENS]
+        return BatchEncoding({"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)})
+    
+    def _to_device(self, encoding):
+        """
+        Copy tokenized inputs to the GPU from pinned host memory without blocking.
+        
+        The copy is queued on the current stream, so the model's first kernels
+        are ordered after it without an explicit synchronize.
+        """
+        return BatchEncoding({
+            key: tensor.pin_memory().to(self.device, non_blocking=True)
+            for key, tensor in encoding.items()
+        })
+    
+    def _find_prompt_prefix(self, text: str, prompt: str, target_language: str, add_comments: bool) -> Optional[str]:
+        """
+        Get the part of the chat-formatted prompt that precedes the user code.
+        
+        The code's position is taken from the prompt template rendered with a
+        sentinel, so code that also occurs in the template text cannot shift it.
+        
+        Args:
+            text: Full chat-formatted prompt
+            prompt: User prompt embedded in text
+            target_language: Target language the prompt was built for
+            add_comments: Comment setting the prompt was built for
+            
+        Returns:
+            Optional[str]: Prefix text, or None if the prompt cannot be located
+        """
+        template = self._create_prompt(_CODE_SENTINEL, target_language, add_comments)
+        prompt_start = text.find(prompt)
+        if prompt_start < 0:
+            return None
+        return text[:prompt_start + template.index(_CODE_SENTINEL)]
+    
+    def _get_prefix_cache(self, prefix_text: str, input_ids):
+        """
+        Get a copy of the KV cache for the prompt text preceding the user code.
+        
+        Args:
+            prefix_text: Chat-formatted prompt up to the user code
+            input_ids: Token ids of the full prompt
+            
+        Returns:
+            Cached past_key_values for the prefix, or None if it cannot be reused
+        """
+        cache_key = LRUCache.make_key(prefix_text)
+        
+        try:
+            cached = self._prefix_caches.get(cache_key)
+            if cached is None:
+                prefix_inputs = self.tokenizer(prefix_text, return_tensors="pt").to(self.device)
+                with self._gpu_lock, torch.no_grad():
+                    outputs = self.model(**prefix_inputs, use_cache=True)
+                cached = (prefix_inputs["input_ids"], outputs.past_key_values)
+                self._prefix_caches.set(cache_key, cached)
+            
+            prefix_ids, past_key_values = cached
+            prefix_length = prefix_ids.shape[1]
+            
+            # Tokens may merge across the prefix boundary; only reuse on an exact match
+            if input_ids.shape[1] <= prefix_length or not torch.equal(input_ids[0, :prefix_length], prefix_ids[0]):
+                return None
+            
+            # generate() extends the cache in place, so hand out a copy
+            return copy.deepcopy(past_key_values)
+        except Exception as e:
+            print(f"Prompt prefix caching skipped: {e}")
+            return None
+    
+    def _cache_kwargs(self, past_key_values=None) -> dict:
+        """Get the generate() arguments selecting the KV cache to decode with."""
+        if self.kv_quant:
+            return {"cache_implementation": "quantized", "cache_config": dict(KV_CACHE_CONFIG)}
+        if self.static_cache:
+            # Sized to prompt + max_new_tokens up front, so decoding never grows the cache;
+            # the fixed shapes also let a compiled decode step be captured once and replayed
+            return {"cache_implementation": "static"}
+        if past_key_values is not None:
+            return {"past_key_values": past_key_values}
+        return {}
+    
+    def _generate_streaming(self, inputs, past_key_values=None):
         """Generate with streaming support."""
         from transformers import TextIteratorStreamer
         from threading import Thread
@@ -105,63 +316,85 @@ class QwenModel(BaseCodeModel):
         streamer = TextIteratorStreamer(
             self.tokenizer,
             skip_prompt=True,
-            skip_special_tokens=True
+            skip_special_tokens=True,
+            timeout=STREAM_TOKEN_TIMEOUT
         )
         
+        stop_event = threading.Event()
+        # Set once this generation holds the GPU (or has failed), so queueing is not timed
+        started_event = threading.Event()
+        generation_errors = []
+        
         # Generation parameters
         generation_kwargs = {
             **inputs,
             "max_new_tokens": 2048,
-            "temperature": 0.1,
-            "top_p": 0.9,
-            "do_sample": True,
+            "do_sample": False,
+            "num_beams": 1,
+            "use_cache": True,
             "pad_token_id": self.tokenizer.eos_token_id,
             "eos_token_id": self.tokenizer.eos_token_id,
-            "streamer": streamer
+            "streamer": streamer,
+            # Lets the consumer end generation early (timeout, abandoned stream)
+            "stopping_criteria": StoppingCriteriaList([_StopOnEvent(stop_event)])
         }
+        generation_kwargs.update(self._cache_kwargs(past_key_values))
+        
+        def run_generate():
+            # Only the generation itself holds the GPU; reading the stream does not
+            try:
+                with self._gpu_lock:
+                    started_event.set()
+                    # The consumer may have given up while this request was queued
+                    if stop_event.is_set():
+                        streamer.end()
+                        return
+                    with torch.no_grad():
+                        self.model.generate(**generation_kwargs)
+            except Exception as e:
+                # Unblock the consumer instead of leaving it to time out
+                generation_errors.append(e)
+                streamer.end()
+            finally:
+                started_event.set()
         
         # Start generation in separate thread
-        thread = Thread(target=self.model.generate, kwargs=generation_kwargs)
+        thread = Thread(target=run_generate, daemon=True)
         thread.start()
         
-        # Collect streamed tokens
-        generated_text = ""
-        for new_text in streamer:
-            generated_text += new_text
-            yield generated_text
+        try:
+            # Wait our turn on the GPU; the token timeout only covers generation itself
+            started_event.wait()
+            # Collect streamed tokens, coalescing those that arrive close together
+            yield from self._coalesce_stream(streamer)
+        except queue.Empty:
+            raise TimeoutError(f"Qwen generation stalled: no tokens for {STREAM_TOKEN_TIMEOUT:.0f}s") from None
+        finally:
+            # On timeout or an abandoned stream, stop generating and free the GPU lock
+            stop_event.set()
+            thread.join(timeout=STREAM_STOP_TIMEOUT)
         
-        thread.join()
+        if generation_errors:
+            raise generation_errors[0]
     
-    def _generate_complete(self, inputs):
+    def _generate_complete(self, inputs, past_key_values=None):
         """Generate complete response at once."""
         # Generate
-        with torch.no_grad():
+        with self._gpu_lock, torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
+                **self._cache_kwargs(past_key_values),
                 max_new_tokens=2048,
-                temperature=0.1,
-                top_p=0.9,
-                do_sample=True,
+                do_sample=False,
+                num_beams=1,
+                use_cache=True,
                 pad_token_id=self.tokenizer.eos_token_id,
                 eos_token_id=self.tokenizer.eos_token_id
             )
         
-        # Decode response
-        response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        
-        # Extract only the assistant's response
-        if "<|im_start|>assistant" in response:
-            assistant_start = response.find("<|im_start|>assistant")
-            response = response[assistant_start + len("<|im_start|>assistant"):]
-            if "<|im_end|>" in response:
-                response = response[:response.find("<|im_end|>")]
-        
-        # Clean up the response
-        response = response.strip()
-        if response.startswith("\n"):
-            response = response[1:]
-        
-        return response
+        # Decode only the generated tokens; the prompt is never detokenized
+        generated_ids = outputs[0, inputs["input_ids"].shape[-1]:]
+        return self.tokenizer.decode(generated_ids, skip_special_tokens=True).strip()
     
     def is_available(self) -> bool:
         """Check if Qwen model is properly loaded."""
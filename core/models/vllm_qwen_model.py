@@ -0,0 +1,120 @@
+import asyncio
+import queue
+import threading
+import uuid
+from typing import Optional
+from .base_model import BaseCodeModel
+
+
+MODEL_NAME = "Qwen/Qwen2.5-7B-Instruct"
+SYSTEM_PROMPT = "You are an expert programmer skilled in converting code between different programming languages."
+
+# Marks the end of a streamed generation
+_STREAM_END = object()
+
+
+class VLLMQwenModel(BaseCodeModel):
+    """Qwen2.5-7B-Instruct served by an in-process vLLM engine with continuous batching."""
+    
+    def __init__(self, api_key: Optional[str] = None):
+        super().__init__(api_key)
+        self.engine = None
+        self.tokenizer = None
+        self.sampling_params = None
+        self._loop = None
+        self._load_engine()
+    
+    def _load_engine(self):
+        """Start the vLLM engine and the event loop that drives it."""
+        try:
+            from transformers import AutoTokenizer
+            from vllm import AsyncEngineArgs, AsyncLLMEngine, SamplingParams
+            
+            self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+            # Greedy decoding, matching QwenModel
+            self.sampling_params = SamplingParams(
+                max_tokens=2048,
+                temperature=0.0
+            )
+            
+            self.engine = AsyncLLMEngine.from_engine_args(
+                AsyncEngineArgs(
+                    model=MODEL_NAME,
+                    trust_remote_code=True,
+                    enable_prefix_caching=True
+                )
+            )
+            
+            # Gradio handlers are synchronous; requests are submitted to this loop
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
+        except Exception as e:
+            print(f"Failed to start vLLM engine: {e}")
+            self.engine = None
+            self.tokenizer = None
+    
+    def convert_code(self, python_code: str, target_language: str, add_comments: bool = False, stream: bool = False) -> str:
+        """Convert Python code using the vLLM engine."""
+        if not self.is_available():
+            raise Exception("vLLM engine is not available. Please check your vLLM and CUDA installation.")
+        
+        prompt = self._create_prompt(python_code, target_language, add_comments)
+        
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        
+        try:
+            text = self.tokenizer.apply_chat_template(
+                messages,
+                tokenize=False,
+                add_generation_prompt=True
+            )
+            
+            if stream:
+                return self._generate_streaming(text)
+            else:
+                return self._generate_complete(text)
+        
+        except Exception as e:
+            raise Exception(f"vLLM generation failed: {str(e)}")
+    
+    def _generate_streaming(self, text: str):
+        """Generate with streaming support."""
+        chunks = queue.Queue()
+        
+        async def produce():
+            try:
+                async for output in self.engine.generate(text, self.sampling_params, uuid.uuid4().hex):
+                    chunks.put(output.outputs[0].text)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(_STREAM_END)
+        
+        asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        
+        while True:
+            item = chunks.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    def _generate_complete(self, text: str) -> str:
+        """Generate complete response at once."""
+        async def collect():
+            final_output = None
+            async for output in self.engine.generate(text, self.sampling_params, uuid.uuid4().hex):
+                final_output = output
+            return final_output.outputs[0].text if final_output else ""
+        
+        response = asyncio.run_coroutine_threadsafe(collect(), self._loop).result()
+        return response.strip()
+    
+    def is_available(self) -> bool:
+        """Check if the vLLM engine is running."""
+        return self.engine is not None and self.tokenizer is not None
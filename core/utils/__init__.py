@@ -4,5 +4,6 @@ Utility functions and classes.
 
 from .validators import CodeValidator
 from .file_utils import FileManager
+from .cache import LRUCache
 
-__all__ = ['CodeValidator', 'FileManager']
\ No newline at end of file
+__all__ = ['CodeValidator', 'FileManager', 'LRUCache']
\ No newline at end of file
@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    """Small in-memory least-recently-used cache, safe to share between threads."""
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a compact cache key from the given parts.
+        
+        Args:
+            *parts: Values identifying the cached entry
+        
+        Returns:
+            str: Hex digest of the joined parts
+        """
+        raw = "|".join(str(part) for part in parts)
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: str, value: Any):
+        """Store value under key, evicting the oldest entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,9 +1,28 @@
+import mmap
 import os
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 
+# File extensions of the languages code can be converted to
+_CODE_EXTENSIONS = MappingProxyType({
+    "c#": ".cs",
+    "c++": ".cpp",
+    "java": ".java"
+})
+
+# File extensions of every language the application handles
+_ALL_EXTENSIONS = MappingProxyType({
+    "python": ".py",
+    **_CODE_EXTENSIONS
+})
+
+# Files at least this large are written through a memory mapping
+_MMAP_WRITE_THRESHOLD = 1 << 20
+
+
 class FileManager:
     """Utility class for file operations."""
     
@@ -24,18 +43,10 @@ class FileManager:
         Raises:
             Exception: If save operation fails
         """
-        
-        extensions = {
-            "c#": ".cs",
-            "c++": ".cpp",
-            "java": ".java"
-        }
-        
-        if language.lower() not in extensions:
+        extension = _CODE_EXTENSIONS.get(language.lower())
+        if extension is None:
             raise ValueError(f"Unsupported language: {language}")
         
-        extension = extensions[language.lower()]
-        
         # Generate filename if not provided
         if not filename:
             filename = f"converted_code{extension}"
@@ -51,12 +62,45 @@ class FileManager:
                 filepath = Path(filename)
             
             # Save the file
-            filepath.write_text(code, encoding='utf-8')
-            return str(filepath.absolute())
+            FileManager.write_bytes(str(filepath), code.encode('utf-8'))
+            return str(filepath if filepath.is_absolute() else filepath.absolute())
             
         except Exception as e:
             raise Exception(f"Failed to save file: {str(e)}")
     
+    @staticmethod
+    def write_bytes(filepath: str, data: bytes):
+        """
+        Write data to a file with unbuffered os-level writes, replacing any existing content.
+        
+        Large files are sized up front and filled through a memory mapping, so
+        the data is copied straight into the page cache. A mapping stores the
+        bytes as given, so on Windows files of _MMAP_WRITE_THRESHOLD bytes or
+        more keep LF newlines, while smaller files get CRLF like a text-mode write.
+        
+        Args:
+            filepath: Path of the file to write
+            data: Encoded file content
+        """
+        if len(data) >= _MMAP_WRITE_THRESHOLD:
+            fd = os.open(filepath, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, len(data))
+                with mmap.mmap(fd, len(data)) as mapped:
+                    mapped[:] = data
+            finally:
+                os.close(fd)
+            return
+        
+        view = memoryview(data)
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
     @staticmethod
     def create_temp_file(code: str, extension: str) -> str:
         """
@@ -87,9 +131,9 @@ class FileManager:
             filepath: Path to file to remove
         """
         try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            os.unlink(filepath)
         except Exception:
+            # Missing files included; cleanup never raises into callers
             pass
     
     @staticmethod
@@ -103,11 +147,4 @@ class FileManager:
         Returns:
             str: File extension including the dot
         """
-        extensions = {
-            "python": ".py",
-            "c#": ".cs",
-            "c++": ".cpp",
-            "java": ".java"
-        }
-        
-        return extensions.get(language.lower(), ".txt")
\ No newline at end of file
+        return _ALL_EXTENSIONS.get(language.lower(), ".txt")
\ No newline at end of file
@@ -1,5 +1,35 @@
 import ast
 from typing import Tuple
+from .cache import LRUCache
+
+# Target languages code can be converted to
+_SUPPORTED_LANGUAGES = frozenset({"c#", "c++", "java"})
+
+# Longer inputs are rejected without parsing
+MAX_CODE_LENGTH = 1_000_000
+
+# Validation verdicts by source digest, so large sources are not kept alive
+_parse_cache = LRUCache(max_size=128)
+
+
+def _parse_ok(code: str) -> Tuple[bool, str]:
+    """Parse code once per distinct source and remember the verdict."""
+    cache_key = LRUCache.make_key(code)
+    result = _parse_cache.get(cache_key)
+    if result is not None:
+        return result
+    
+    try:
+        compile(code, "<validate>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+        result = True, ""
+    except SyntaxError as e:
+        result = False, f"Syntax error in code: {e.msg} at line {e.lineno}"
+    except Exception as e:
+        result = False, f"Validation error: {str(e)}"
+    
+    _parse_cache.set(cache_key, result)
+    return result
+
 
 class CodeValidator:
     """Utility class for validating Python code."""
@@ -16,13 +46,13 @@ class CodeValidator:
         if not code.strip():
             return False, "Code is empty or only contains whitespace."
         
-        try:
-            ast.parse(code)
-            return True, ""
-        except SyntaxError as e:
-            return False, f"Syntax error in code: {e.msg} at line {e.lineno}"
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+        if len(code) > MAX_CODE_LENGTH:
+            return False, f"Code is too long ({len(code):,} characters, maximum {MAX_CODE_LENGTH:,})."
+        
+        if "\x00" in code:
+            return False, "Code contains null bytes."
+        
+        return _parse_ok(code)
         
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
@@ -48,5 +78,4 @@ class CodeValidator:
         :return: True if the language is supported, False otherwise.
         """
         
-        supported = {"c#", "c++", "java"}
-        return language.lower() in supported
\ No newline at end of file
+        return language.lower() in _SUPPORTED_LANGUAGES
\ No newline at end of file